@@ -1,23 +1,65 @@
 #!/usr/bin/env python3
 """Validate a multi-agent architecture description for dysfunction patterns.
 
-Usage: python validate_architecture.py <architecture_description_file>
+Usage: python validate_architecture.py [--no-cache] [--max-size BYTES] <architecture_description_file>
 
 Reads a YAML or JSON file describing an agent architecture and checks for
 known dysfunction patterns documented in "The Organizational Physics of
 Multi-Agent AI" (McEntire, 2026).
+
+Findings are cached under $XDG_CACHE_HOME/mace/validate (default
+~/.cache/mace/validate), keyed by the file content, so repeated CI runs on
+an unchanged file skip parsing and scanning. Pass --no-cache to bypass it.
+
+Files larger than 8 MiB are rejected before they are read, to bound time and
+memory in CI. Pass --max-size BYTES to change the limit (0 disables it).
 """
 
+from __future__ import annotations
+
+import argparse
+import hashlib
 import json
+import os
 import sys
+from collections import deque
+from collections.abc import Iterator, Mapping, Sequence
 from pathlib import Path
 
 try:
     import yaml
+    try:
+        from yaml import CSafeLoader as YamlLoader
+    except ImportError:
+        from yaml import SafeLoader as YamlLoader
     HAS_YAML = True
 except ImportError:
     HAS_YAML = False
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import ahocorasick_rs
+    HAS_AHOCORASICK_RS = True
+except ImportError:
+    HAS_AHOCORASICK_RS = False
+
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+try:
+    import re2
+    HAS_RE2 = True
+except ImportError:
+    HAS_RE2 = False
+
 
 DYSFUNCTION_PATTERNS = {
     "review_chain": {
@@ -64,94 +106,327 @@ DYSFUNCTION_PATTERNS = {
 }
 
 
-def load_architecture(filepath: str) -> dict:
-    """Load architecture description from YAML or JSON."""
+# DYSFUNCTION_PATTERNS as parallel tuples, so the hot loops zip over flat
+# sequences instead of indexing nested dicts on every iteration.
+PATTERN_NAMES = tuple(DYSFUNCTION_PATTERNS)
+PATTERN_KEYWORDS = tuple(
+    tuple(kw.lower() for kw in DYSFUNCTION_PATTERNS[name]["keywords"]) for name in PATTERN_NAMES
+)
+PATTERN_SEVERITIES = tuple(DYSFUNCTION_PATTERNS[name]["severity"] for name in PATTERN_NAMES)
+PATTERN_DESCRIPTIONS = tuple(DYSFUNCTION_PATTERNS[name]["description"] for name in PATTERN_NAMES)
+PATTERN_FIXES = tuple(DYSFUNCTION_PATTERNS[name]["fix"] for name in PATTERN_NAMES)
+
+KEYWORDS_LOWER = dict(zip(PATTERN_NAMES, PATTERN_KEYWORDS))
+ALL_KEYWORDS = tuple(dict.fromkeys(kw for kws in KEYWORDS_LOWER.values() for kw in kws))
+
+CONTRACT_KEYWORDS = ("contract", "interface_spec", "typed_interface", "componentcontract")
+TEST_GATE_KEYWORDS = ("test_suite", "contract_test", "mechanical_gate", "pass_fail")
+
+# Positive indicators of contract-first design, scanned alongside the patterns.
+INDICATOR_KEYWORDS = {
+    "contracts": CONTRACT_KEYWORDS,
+    "tests": TEST_GATE_KEYWORDS,
+}
+
+
+def build_keyword_index(keywords_by_name: Mapping[str, Sequence[str]]) -> dict[str, list[str]]:
+    """Map each keyword to every name whose keyword list contains it."""
+    index: dict[str, list[str]] = {}
+    for name, keywords in keywords_by_name.items():
+        for kw in keywords:
+            index.setdefault(kw, []).append(name)
+    return index
+
+
+# Reverse indexes from keyword to the patterns / indicators it counts towards,
+# so a hit resolves in one lookup even when several patterns share a keyword.
+# The automata are built over the unique keywords in SCAN_KEYWORDS.
+KEYWORD_TO_PATTERNS = build_keyword_index(KEYWORDS_LOWER)
+KEYWORD_TO_INDICATORS = build_keyword_index(INDICATOR_KEYWORDS)
+SCAN_KEYWORDS = tuple(dict.fromkeys([*KEYWORD_TO_PATTERNS, *KEYWORD_TO_INDICATORS]))
+
+# Position of each keyword in its pattern's list, to keep evidence in order.
+KEYWORD_RANKS = {
+    pattern_name: {kw: rank for rank, kw in enumerate(keywords)}
+    for pattern_name, keywords in KEYWORDS_LOWER.items()
+}
+
+
+def build_automaton():
+    """Build an automaton over SCAN_KEYWORDS with ahocorasick_rs or pyahocorasick, else None.
+
+    No regex tier for collecting matches: finditer misses overlapping
+    keywords. re2 is only used as a yes/no screen (see KEYWORD_SCREEN).
+    """
+    if HAS_AHOCORASICK_RS:
+        return ahocorasick_rs.AhoCorasick(list(SCAN_KEYWORDS))
+    if HAS_AHOCORASICK:
+        automaton = ahocorasick.Automaton()
+        for kw in SCAN_KEYWORDS:
+            automaton.add_word(kw, kw)
+        automaton.make_automaton()
+        return automaton
+    return None
+
+
+KEYWORD_AUTOMATON = build_automaton()
+
+# Without an automaton, one re2 search rules out keyword-free text far faster
+# than an `in` scan per keyword.
+KEYWORD_SCREEN = (
+    re2.compile("|".join(map(re2.escape, ALL_KEYWORDS)))
+    if HAS_RE2 and KEYWORD_AUTOMATON is None
+    else None
+)
+
+
+def add_automaton_hits(text_lower: str, hits: set[str]) -> None:
+    """Add every SCAN_KEYWORDS keyword found in lowercased text to `hits`."""
+    if HAS_AHOCORASICK_RS:
+        # One batched call returns every match; overlapping so that e.g.
+        # "contract" is still seen inside "contract_test".
+        matches = KEYWORD_AUTOMATON.find_matches_as_indexes(text_lower, overlapping=True)
+        hits.update(SCAN_KEYWORDS[i] for i, _, _ in matches)
+    else:
+        hits.update(kw for _, kw in KEYWORD_AUTOMATON.iter(text_lower))
+
+
+def classify_hits(hits: set[str]) -> tuple[dict[str, list[str]], set[str]]:
+    """Split keyword hits into per-pattern keyword lists and indicator names."""
+    matched: dict[str, list[str]] = {pattern_name: [] for pattern_name in KEYWORDS_LOWER}
+    indicators: set[str] = set()
+    for kw in hits:
+        for pattern_name in KEYWORD_TO_PATTERNS.get(kw, ()):
+            matched[pattern_name].append(kw)
+        indicators.update(KEYWORD_TO_INDICATORS.get(kw, ()))
+    for pattern_name, keywords in matched.items():
+        if len(keywords) > 1:
+            keywords.sort(key=KEYWORD_RANKS[pattern_name].__getitem__)
+    return matched, indicators
+
+
+def json_loads(content: bytes):
+    """Parse JSON bytes, using orjson when it is installed."""
+    if HAS_ORJSON:
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            pass  # the stdlib also accepts NaN/Infinity and >64-bit integers
+    return json.loads(content)
+
+
+MAX_ARCH_BYTES = 8 * 1024 * 1024
+
+
+def check_file_size(filepath: str, max_bytes: int = MAX_ARCH_BYTES) -> None:
+    """Exit before reading a file larger than `max_bytes` (0 disables the check)."""
+    size = Path(filepath).stat().st_size
+    if max_bytes and size > max_bytes:
+        print(f"ERROR: {filepath} is {size} bytes (limit {max_bytes}). Raise it with --max-size.")
+        sys.exit(2)
+
+
+def non_negative_int(value: str) -> int:
+    """argparse type for --max-size: an integer of at least 0."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}") from None
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or more, got {number}")
+    return number
+
+
+def load_architecture(
+    filepath: str, content: bytes | None = None, max_bytes: int = MAX_ARCH_BYTES
+) -> dict:
+    """Load architecture description from YAML or JSON.
+
+    If `content` is given it is parsed in place of reading `filepath`; the
+    path is then only used to pick the format from its suffix. Otherwise
+    files over `max_bytes` are rejected before anything is read.
+    """
     path = Path(filepath)
-    content = path.read_text()
+    if content is None:
+        check_file_size(filepath, max_bytes)
 
     if path.suffix in (".yaml", ".yml"):
         if not HAS_YAML:
             print("ERROR: pyyaml required for YAML files. Install: pip install pyyaml")
             sys.exit(1)
-        return yaml.safe_load(content)
+        if content is not None:
+            return yaml.load(content, Loader=YamlLoader)
+        with path.open("rb") as fh:
+            return yaml.load(fh, Loader=YamlLoader)
     elif path.suffix == ".json":
-        return json.loads(content)
+        return json_loads(path.read_bytes() if content is None else content)
     else:
-        # try JSON first, then YAML
+        # try JSON first, then YAML, from a single read of the file
+        if content is None:
+            content = path.read_bytes()
         try:
-            return json.loads(content)
+            return json_loads(content)
         except json.JSONDecodeError:
             if HAS_YAML:
-                return yaml.safe_load(content)
+                return yaml.load(content, Loader=YamlLoader)
             raise ValueError(f"Cannot parse {filepath}. Use .json or .yaml format.")
 
 
-def check_keywords(text: str, keywords: list[str]) -> list[str]:
-    """Check if any dysfunction keywords appear in the text."""
-    text_lower = text.lower()
-    return [kw for kw in keywords if kw.lower() in text_lower]
-
-
-def flatten_to_text(obj, depth=0) -> str:
-    """Recursively flatten a dict/list to searchable text."""
-    if depth > 10:
-        return ""
-    if isinstance(obj, str):
-        return obj
-    if isinstance(obj, dict):
-        parts = []
-        for k, v in obj.items():
-            parts.append(str(k))
-            parts.append(flatten_to_text(v, depth + 1))
-        return " ".join(parts)
-    if isinstance(obj, (list, tuple)):
-        return " ".join(flatten_to_text(item, depth + 1) for item in obj)
-    return str(obj)
+def check_keywords(text_lower: str, keywords: Sequence[str]) -> list[str]:
+    """Check if any lowercase dysfunction keywords appear in lowercased text."""
+    return [kw for kw in keywords if kw in text_lower]
+
+
+def first_hit(text_lower: str, keywords: Sequence[str]) -> int:
+    """Return the index of the first keyword present in lowercased text, or -1."""
+    return next((i for i, kw in enumerate(keywords) if kw in text_lower), -1)
+
+
+def scan_keywords(text_lower: str) -> tuple[dict[str, list[str]], set[str]]:
+    """Scan lowercased text for dysfunction and indicator keywords.
+
+    Returns the keywords found per dysfunction pattern and the names of the
+    positive indicators (see INDICATOR_KEYWORDS) that are present. Uses a
+    single Aho-Corasick pass when ahocorasick_rs or pyahocorasick is
+    installed, otherwise scans each keyword list in turn.
+    """
+    if KEYWORD_AUTOMATON is None:
+        indicators = {
+            indicator
+            for indicator, keywords in INDICATOR_KEYWORDS.items()
+            if first_hit(text_lower, keywords) >= 0
+        }
+        if KEYWORD_SCREEN is not None:
+            any_hit = KEYWORD_SCREEN.search(text_lower) is not None
+        else:
+            any_hit = first_hit(text_lower, ALL_KEYWORDS) >= 0
+        if not any_hit:
+            return {pattern_name: [] for pattern_name in KEYWORDS_LOWER}, indicators
+        matched: dict[str, list[str]] = {}
+        for pattern_name, keywords in KEYWORDS_LOWER.items():
+            i = first_hit(text_lower, keywords)
+            if i < 0:
+                matched[pattern_name] = []
+                continue
+            # Pattern fires; only now collect the remaining keywords for evidence.
+            matched[pattern_name] = [keywords[i]] + check_keywords(text_lower, keywords[i + 1:])
+        return matched, indicators
+
+    hits: set[str] = set()
+    add_automaton_hits(text_lower, hits)
+    return classify_hits(hits)
+
+
+def iter_leaf_strings(obj) -> Iterator[str]:
+    """Yield every dict key and leaf value of a dict/list as a string.
+
+    Walks the structure with an explicit stack in document order, so any
+    depth is covered without touching the recursion limit.
+    """
+    stack = deque([obj])
+    while stack:
+        cur = stack.pop()
+        # Deliberate exact-type chain, faster than a dispatch table; str subclasses reach str().
+        if type(cur) is str:
+            yield cur
+        elif isinstance(cur, dict):
+            # Push in reverse so keys and values come off in document order.
+            for k, v in reversed(cur.items()):
+                stack.append(v)
+                stack.append(k if type(k) is str else str(k))
+        elif isinstance(cur, (list, tuple)):
+            stack.extend(reversed(cur))
+        else:
+            yield str(cur)
+
+
+def flatten_to_text(obj) -> str:
+    """Flatten a dict/list to searchable text."""
+    return " ".join(iter_leaf_strings(obj))
+
+
+# Leaves are joined into chunks of about this many characters per automaton
+# call: enough to amortize the call overhead, small enough to bound memory.
+SCAN_CHUNK_CHARS = 64 * 1024
+
+
+def scan_architecture(arch) -> tuple[dict[str, list[str]], set[str]]:
+    """Return per-pattern keyword matches and indicators found in an architecture.
+
+    Leaves are scanned separately, which relies on no keyword spanning two leaves.
+    """
+    if KEYWORD_AUTOMATON is None:
+        return scan_keywords(" ".join(dict.fromkeys(iter_leaf_strings(arch))).lower())
+
+    hits: set[str] = set()
+    seen: set[str] = set()
+    chunk = []
+    chunk_chars = 0
+    for leaf in iter_leaf_strings(arch):
+        if leaf in seen:
+            continue
+        seen.add(leaf)
+        chunk.append(leaf)
+        chunk_chars += len(leaf) + 1
+        if chunk_chars >= SCAN_CHUNK_CHARS:
+            add_automaton_hits(" ".join(chunk).lower(), hits)
+            chunk.clear()
+            chunk_chars = 0
+    if chunk:
+        add_automaton_hits(" ".join(chunk).lower(), hits)
+    return classify_hits(hits)
+
+
+STAGE_KEYS = ("stages", "pipeline", "phases")
+AGENT_KEYS = ("agents", "roles", "workers")
+
+
+def count_first_key(arch: dict, keys: tuple[str, ...]) -> int:
+    """Count entries under the first of `keys` present in the architecture."""
+    for key in keys:
+        value = arch.get(key)
+        if value is not None:
+            return len(value) if isinstance(value, (list, dict)) else 0
+    return 0
 
 
 def count_stages(arch: dict) -> int:
     """Count pipeline stages in the architecture."""
-    stages = arch.get("stages", arch.get("pipeline", arch.get("phases", [])))
-    if isinstance(stages, list):
-        return len(stages)
-    if isinstance(stages, dict):
-        return len(stages)
-    return 0
+    return count_first_key(arch, STAGE_KEYS)
 
 
 def count_agents(arch: dict) -> int:
     """Count agents in the architecture."""
-    agents = arch.get("agents", arch.get("roles", arch.get("workers", [])))
-    if isinstance(agents, (list, dict)):
-        return len(agents)
-    return 0
+    return count_first_key(arch, AGENT_KEYS)
 
 
 def validate(arch: dict) -> list[dict]:
     """Run all dysfunction checks. Returns list of findings."""
     findings = []
-    full_text = flatten_to_text(arch)
+    matched_by_pattern, indicators = scan_architecture(arch)
 
-    for pattern_name, pattern in DYSFUNCTION_PATTERNS.items():
+    for pattern_name, severity, description, fix in zip(
+        PATTERN_NAMES, PATTERN_SEVERITIES, PATTERN_DESCRIPTIONS, PATTERN_FIXES
+    ):
         if pattern_name == "excessive_pipeline":
             stage_count = count_stages(arch)
             if stage_count > 4:
                 findings.append({
                     "pattern": pattern_name,
-                    "severity": pattern["severity"],
-                    "description": pattern["description"],
-                    "fix": pattern["fix"],
+                    "severity": severity,
+                    "description": description,
+                    "fix": fix,
                     "evidence": f"Found {stage_count} stages (max recommended: 4)",
                 })
             continue
 
-        matched = check_keywords(full_text, pattern["keywords"])
+        matched = matched_by_pattern[pattern_name]
         if matched:
             findings.append({
                 "pattern": pattern_name,
-                "severity": pattern["severity"],
-                "description": pattern["description"],
-                "fix": pattern["fix"],
+                "severity": severity,
+                "description": description,
+                "fix": fix,
                 "evidence": f"Keywords found: {', '.join(matched)}",
             })
 
@@ -167,14 +442,8 @@ def validate(arch: dict) -> list[dict]:
         })
 
     # Check for contract-first indicators (positive)
-    has_contracts = any(
-        kw in full_text.lower()
-        for kw in ["contract", "interface_spec", "typed_interface", "componentcontract"]
-    )
-    has_tests = any(
-        kw in full_text.lower()
-        for kw in ["test_suite", "contract_test", "mechanical_gate", "pass_fail"]
-    )
+    has_contracts = "contracts" in indicators
+    has_tests = "tests" in indicators
 
     if not has_contracts:
         findings.append({
@@ -197,41 +466,134 @@ def validate(arch: dict) -> list[dict]:
     return findings
 
 
+def cache_dir() -> Path | None:
+    """Return the findings cache directory, or None if no home can be found."""
+    base = os.environ.get("XDG_CACHE_HOME")
+    if not base:
+        try:
+            base = str(Path.home() / ".cache")
+        except RuntimeError:
+            return None
+    return Path(base) / "mace" / "validate"
+
+
+def cache_key(content: bytes, suffix: str) -> str | None:
+    """Hash the validator source, file suffix, and file content into a cache key.
+
+    Including this script's own source means editing the patterns or checks
+    invalidates every earlier result. Returns None when the source can't be
+    read (e.g. run from stdin or exec()), in which case the cache is skipped.
+    """
+    try:
+        digest = hashlib.sha256(Path(__file__).read_bytes())
+    except (OSError, NameError):
+        return None
+    digest.update(suffix.encode())
+    digest.update(b"\0")
+    digest.update(content)
+    return digest.hexdigest()
+
+
+FINDING_FIELDS = frozenset(("pattern", "severity", "description", "fix", "evidence"))
+
+
+def read_cached_findings(key: str) -> list[dict] | None:
+    """Return cached findings for `key`, or None on a miss or unreadable entry."""
+    directory = cache_dir()
+    if directory is None:
+        return None
+    try:
+        entry = json_loads((directory / f"{key}.json").read_bytes())
+    except (OSError, ValueError):
+        return None
+    # Entries name their own key, so a stray "[]" can't pass as a clean result.
+    if not isinstance(entry, dict) or entry.get("key") != key:
+        return None
+    findings = entry.get("findings")
+    if not isinstance(findings, list) or not all(
+        isinstance(f, dict) and FINDING_FIELDS <= f.keys() for f in findings
+    ):
+        return None
+    return findings
+
+
+def write_cached_findings(key: str, findings: list[dict]) -> None:
+    """Store findings for `key`. A failed write only costs a later cache miss."""
+    directory = cache_dir()
+    if directory is None:
+        return
+    try:
+        os.makedirs(directory, exist_ok=True)
+        # Write then rename so concurrent CI jobs never read a partial entry.
+        tmp = directory / f"{key}.{os.getpid()}.tmp"
+        tmp.write_text(json.dumps({"key": key, "findings": findings}))
+        os.replace(tmp, directory / f"{key}.json")
+    except OSError:
+        pass
+
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python validate_architecture.py <architecture_file.yaml|json>")
-        print("\nValidates a multi-agent architecture for dysfunction patterns.")
+    parser = argparse.ArgumentParser(
+        usage=(
+            "python validate_architecture.py [--no-cache] [--max-size BYTES] "
+            "<architecture_file.yaml|json>"
+        ),
+        description="Validates a multi-agent architecture for dysfunction patterns.",
+    )
+    parser.add_argument("filepath", nargs="?", metavar="architecture_file.yaml|json")
+    parser.add_argument("--no-cache", action="store_true", help="skip the findings cache")
+    parser.add_argument(
+        "--max-size", type=non_negative_int, default=MAX_ARCH_BYTES, metavar="BYTES",
+        help=f"reject larger files (default {MAX_ARCH_BYTES}; 0 disables the check)",
+    )
+    args = parser.parse_args()
+
+    if args.filepath is None:
+        print(f"Usage: {parser.usage}")
+        print(f"\n{parser.description}")
         sys.exit(1)
 
-    filepath = sys.argv[1]
+    filepath = args.filepath
     if not Path(filepath).exists():
         print(f"ERROR: File not found: {filepath}")
         sys.exit(1)
 
-    arch = load_architecture(filepath)
-    findings = validate(arch)
+    if args.no_cache:
+        findings = validate(load_architecture(filepath, max_bytes=args.max_size))
+    else:
+        check_file_size(filepath, args.max_size)
+        content = Path(filepath).read_bytes()
+        key = cache_key(content, Path(filepath).suffix)
+        findings = None if key is None else read_cached_findings(key)
+        if findings is None:
+            findings = validate(load_architecture(filepath, content))
+            if key is not None:
+                write_cached_findings(key, findings)
 
     if not findings:
-        print("PASS: No dysfunction patterns detected.")
-        print("Architecture appears to follow contract-first coordination principles.")
+        sys.stdout.write(
+            "PASS: No dysfunction patterns detected.\n"
+            "Architecture appears to follow contract-first coordination principles.\n"
+        )
         sys.exit(0)
 
-    print(f"FINDINGS: {len(findings)} potential dysfunction pattern(s) detected\n")
-
+    # Build the whole report and emit it with one write.
+    lines = [f"FINDINGS: {len(findings)} potential dysfunction pattern(s) detected", ""]
     for i, f in enumerate(findings, 1):
-        print(f"  [{f['severity']}] {i}. {f['pattern']}")
-        print(f"    Problem:  {f['description']}")
-        print(f"    Evidence: {f['evidence']}")
-        print(f"    Fix:      {f['fix']}")
-        print()
+        lines.append(f"  [{f['severity']}] {i}. {f['pattern']}")
+        lines.append(f"    Problem:  {f['description']}")
+        lines.append(f"    Evidence: {f['evidence']}")
+        lines.append(f"    Fix:      {f['fix']}")
+        lines.append("")
 
     high_count = sum(1 for f in findings if f["severity"] == "HIGH")
     if high_count > 0:
-        print(f"FAIL: {high_count} HIGH severity issue(s). Architecture needs redesign.")
-        sys.exit(1)
+        lines.append(f"FAIL: {high_count} HIGH severity issue(s). Architecture needs redesign.")
     else:
-        print("WARN: Issues found but none are HIGH severity. Review recommended.")
-        sys.exit(0)
+        lines.append("WARN: Issues found but none are HIGH severity. Review recommended.")
+    lines.append("")
+    sys.stdout.write("\n".join(lines))
+    sys.exit(1 if high_count > 0 else 0)
 
 
 if __name__ == "__main__":